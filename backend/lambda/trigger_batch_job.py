@@ -4,10 +4,13 @@ Triggered by: S3 PutObject event via EventBridge
 """
 
 import json
+import math
 import os
 import logging
 import boto3
 from datetime import datetime
+from decimal import Decimal
+from typing import Optional
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -15,12 +18,94 @@ logger.setLevel(logging.INFO)
 # AWS clients
 batch = boto3.client('batch')
 s3 = boto3.client('s3')
+dynamodb = boto3.resource('dynamodb', region_name=os.environ.get('AWS_REGION', 'us-west-2'))
 
 # Environment variables
 JOB_QUEUE = os.environ['BATCH_JOB_QUEUE']
 JOB_DEFINITION = os.environ['BATCH_JOB_DEFINITION']
 DATABASE_URL = os.environ['DATABASE_URL']
 HF_TOKEN = os.environ.get('HF_TOKEN', '')
+TABLE_NAME = os.environ.get('DYNAMODB_TABLE', 'ever15-prod')
+table = dynamodb.Table(TABLE_NAME)
+
+# Routing tiers: short/small uploads go to the CPU (int8) queue, everything else to GPU.
+# The CPU tier is disabled unless both its queue and job definition are configured.
+CPU_JOB_QUEUE = os.environ.get('CPU_BATCH_JOB_QUEUE', '')
+CPU_JOB_DEFINITION = os.environ.get('CPU_BATCH_JOB_DEFINITION', '')
+CPU_MAX_BYTES = int(os.environ.get('ROUTING_CPU_MAX_BYTES', str(50 * 1024 * 1024)))   # 50 MB
+CPU_MAX_DURATION_SEC = float(os.environ.get('ROUTING_CPU_MAX_DURATION_SEC', '120'))  # 2 minutes
+
+
+def route_job(content_length: int, duration: Optional[float] = None) -> dict:
+    """
+    Pick the Batch queue/job definition for an upload
+    Size is a hard cap for the CPU tier; client-supplied duration can only
+    tighten the decision, never move a large upload onto CPU
+    Returns: dict with tier, jobQueue, jobDefinition and reason
+    """
+    gpu = {'tier': 'GPU', 'jobQueue': JOB_QUEUE, 'jobDefinition': JOB_DEFINITION}
+    cpu = {'tier': 'CPU', 'jobQueue': CPU_JOB_QUEUE, 'jobDefinition': CPU_JOB_DEFINITION}
+
+    if not CPU_JOB_QUEUE or not CPU_JOB_DEFINITION:
+        return {**gpu, 'reason': 'CPU tier not configured'}
+
+    if not content_length:
+        return {**gpu, 'reason': 'size unknown'}
+
+    if content_length > CPU_MAX_BYTES:
+        return {**gpu, 'reason': f'size {content_length} > {CPU_MAX_BYTES} bytes'}
+
+    if duration is not None and duration > CPU_MAX_DURATION_SEC:
+        return {**gpu, 'reason': f'duration {duration:.0f}s > {CPU_MAX_DURATION_SEC:.0f}s'}
+
+    reason = f'size {content_length} <= {CPU_MAX_BYTES} bytes'
+    if duration is not None:
+        reason += f', duration {duration:.0f}s <= {CPU_MAX_DURATION_SEC:.0f}s'
+    return {**cpu, 'reason': reason}
+
+
+def parse_duration(value) -> Optional[float]:
+    """Parse a duration in seconds; None if missing, non-numeric, non-finite or negative"""
+    if value is None or value == '':
+        return None
+    try:
+        duration = float(value)
+    except (TypeError, ValueError):
+        duration = None
+    if duration is None or not math.isfinite(duration) or duration < 0:
+        logger.warning(f"Ignoring invalid duration: {value!r}")
+        return None
+    return duration
+
+
+def get_task_duration(task_id: str) -> Optional[float]:
+    """Read the video duration stored on the Task payload by start-processing"""
+    try:
+        response = table.get_item(
+            Key={'pk': f'task#{task_id}', 'sk': f'task#{task_id}'},
+            ProjectionExpression='payload.#duration',
+            ExpressionAttributeNames={'#duration': 'duration'}
+        )
+    except Exception as e:
+        logger.warning(f"Could not read duration from task {task_id}: {e}")
+        return None
+    return parse_duration(response.get('Item', {}).get('payload', {}).get('duration'))
+
+
+def record_routing(task_id: str, routing: dict, batch_job_id: str):
+    """Store the routing decision and Batch job ID on the Task payload"""
+    # DynamoDB does not accept Python floats
+    routing = {k: Decimal(str(v)) if isinstance(v, float) else v for k, v in routing.items()}
+    try:
+        table.update_item(
+            Key={'pk': f'task#{task_id}', 'sk': f'task#{task_id}'},
+            UpdateExpression='SET payload.routing = :routing, payload.batchJobId = :jobId',
+            ConditionExpression='attribute_exists(payload)',
+            ExpressionAttributeValues={':routing': routing, ':jobId': batch_job_id}
+        )
+    except Exception as e:
+        # Routing info is diagnostic only - never fail the submission over it
+        logger.warning(f"Could not record routing on task {task_id}: {e}")
 
 
 def lambda_handler(event, context):
@@ -69,6 +154,7 @@ def lambda_handler(event, context):
             metadata = head_response.get('Metadata', {})
             user_media_id = metadata.get('usermediaid', '')
             task_id = metadata.get('taskid', '')
+            content_length = head_response.get('ContentLength', 0)
         except Exception as e:
             logger.warning(f"Could not get object metadata: {e}")
             # If metadata is not set, we need to query the database
@@ -86,6 +172,15 @@ def lambda_handler(event, context):
                 'body': 'Missing UserMedia/Task IDs'
             }
 
+        # Duration (seconds) from the Task payload, falling back to object metadata
+        duration = get_task_duration(task_id)
+        if duration is None:
+            duration = parse_duration(metadata.get('duration'))
+
+        routing = route_job(content_length, duration)
+        routing.update({'contentLength': content_length, 'duration': duration})
+        logger.info(f"Routing to {routing['tier']} tier ({routing['reason']}): {routing['jobQueue']}")
+
         # Generate unique job name
         job_name = f"video-process-{user_media_id}-{int(datetime.now().timestamp())}"
 
@@ -94,8 +189,8 @@ def lambda_handler(event, context):
 
         response = batch.submit_job(
             jobName=job_name,
-            jobQueue=JOB_QUEUE,
-            jobDefinition=JOB_DEFINITION,
+            jobQueue=routing['jobQueue'],
+            jobDefinition=routing['jobDefinition'],
             containerOverrides={
                 'environment': [
                     {'name': 'VIDEO_KEY', 'value': key},
@@ -111,8 +206,7 @@ def lambda_handler(event, context):
         batch_job_id = response['jobId']
         logger.info(f"✓ Batch job submitted: {batch_job_id}")
 
-        # Optionally: Update Task record with batch job ID
-        # (Would require database connection here or separate Lambda)
+        record_routing(task_id, routing, batch_job_id)
 
         return {
             'statusCode': 200,
@@ -120,6 +214,7 @@ def lambda_handler(event, context):
                 'message': 'Batch job submitted',
                 'jobId': batch_job_id,
                 'jobName': job_name,
+                'tier': routing['tier'],
                 'userMediaId': user_media_id,
                 'taskId': task_id
             })
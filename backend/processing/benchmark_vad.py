@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark the VAD silence-removal pre-pass on sample recordings
+Reports per-file removed fraction, cut-audio level vs noise floor, VAD runtime and
+any fallback, using the same decision logic as process_video.remove_silence
+
+Usage:
+    python3 benchmark_vad.py interview1.wav interview2.mp4 ...
+
+Inputs must be 16 kHz mono WAV; .mp4 videos are converted with extract_audio (FFmpeg).
+VAD_* environment variables tune the pass exactly as in process_video.py.
+"""
+
+import sys
+import wave
+
+import numpy as np
+
+from process_video import (
+    VAD_SAMPLE_RATE,
+    extract_audio,
+    plan_silence_removal,
+)
+
+
+def load_wav(path: str) -> np.ndarray:
+    """Load a 16 kHz mono 16-bit WAV as float32 in [-1, 1]; .mp4 inputs go through extract_audio"""
+    if path.endswith('.mp4'):
+        path = extract_audio(path)
+
+    with wave.open(path, 'rb') as wav:
+        if (wav.getframerate(), wav.getnchannels(), wav.getsampwidth()) != (VAD_SAMPLE_RATE, 1, 2):
+            raise ValueError(f"{path}: expected 16 kHz mono 16-bit WAV (or an .mp4 to extract)")
+        frames = wav.readframes(wav.getnframes())
+
+    return np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def main(paths):
+    total_original = 0.0
+    total_compacted = 0.0
+
+    print(f"{'file':40} {'orig_s':>9} {'kept_s':>9} {'removed':>8} {'cut_dB':>7} {'vad_ms':>8}  fallback")
+    for path in paths:
+        _, _, stats = plan_silence_removal(load_wav(path))
+
+        total_original += stats['original_sec']
+        total_compacted += stats['compacted_sec']
+
+        excess = f"{stats['cut_excess_db']:7.1f}" if stats['cut_excess_db'] is not None else f"{'-':>7}"
+        print(f"{path[-40:]:40} {stats['original_sec']:9.1f} {stats['compacted_sec']:9.1f} "
+              f"{stats['removed_fraction']:8.1%} {excess} {stats['vad_ms']:8.0f}  {stats['fallback'] or ''}")
+
+    if total_original:
+        print(f"\nTotal: {total_original:.1f}s -> {total_compacted:.1f}s "
+              f"({1 - total_compacted / total_original:.1%} removed)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    main(sys.argv[1:])
@@ -18,6 +18,8 @@ import sys
 import json
 import logging
 import subprocess
+import time
+from bisect import bisect_right
 from pathlib import Path
 from typing import Dict, Any, Tuple, List
 import boto3
@@ -38,6 +40,23 @@ dynamodb = boto3.resource('dynamodb', region_name=os.environ.get('AWS_REGION', '
 TABLE_NAME = os.environ.get('DYNAMODB_TABLE', 'ever15-prod')
 table = dynamodb.Table(TABLE_NAME)
 
+# Voice-activity pre-pass (strips silence before WhisperX)
+# Off by default until validated on real interview recordings
+VAD_ENABLED = os.environ.get('VAD_ENABLED', 'false').lower() == 'true'
+VAD_SAMPLE_RATE = 16000                                               # matches extract_audio output
+VAD_FRAME_MS = int(os.environ.get('VAD_FRAME_MS', '30'))
+VAD_NOISE_BLOCK_MS = int(os.environ.get('VAD_NOISE_BLOCK_MS', '500'))     # noise floor = quietest frame per block
+VAD_NOISE_MARGIN_DB = float(os.environ.get('VAD_NOISE_MARGIN_DB', '12'))  # above estimated noise floor
+VAD_MAX_CUT_EXCESS_DB = float(os.environ.get('VAD_MAX_CUT_EXCESS_DB', '6'))  # cut audio vs noise floor, else keep all
+VAD_MIN_SILENCE_MS = int(os.environ.get('VAD_MIN_SILENCE_MS', '1000'))    # only cut pauses longer than this
+VAD_PADDING_MS = int(os.environ.get('VAD_PADDING_MS', '250'))             # keep around each speech region
+
+# Summarizer precision: auto | fp16 | 8bit | 4bit (GPU, bitsandbytes) | cpu-int8 (torch dynamic quantization)
+# auto picks fp16 on GPU and cpu-int8 otherwise; 4bit fits alongside WhisperX on 16 GB GPUs
+LLAMA_MODEL_NAME = os.environ.get('LLAMA_MODEL_NAME', 'meta-llama/Llama-3.2-3B-Instruct')
+LLAMA_PRECISION = os.environ.get('LLAMA_PRECISION', 'auto').lower()
+LLAMA_PRECISION_MODES = ('auto', 'fp16', '8bit', '4bit', 'cpu-int8')
+
 
 def update_task_status(task_id: str, status: str, current_step: str, error_message: str = None):
     """Update task status in DynamoDB"""
@@ -229,6 +248,198 @@ def extract_audio(video_path: str) -> str:
         raise
 
 
+def detect_speech_regions(audio, sample_rate: int = VAD_SAMPLE_RATE) -> Tuple[List[Tuple[int, int]], float]:
+    """
+    Fast energy-based voice activity detection on a mono float32 array
+    Returns: (regions, noise_floor_db) where regions is a list of padded, merged
+    (start_sample, end_sample) speech regions
+    """
+    import numpy as np
+
+    frame_len = max(1, int(sample_rate * VAD_FRAME_MS / 1000))
+    num_frames = len(audio) // frame_len
+    if num_frames == 0:
+        return ([(0, len(audio))] if len(audio) else []), None
+
+    # Per-frame RMS energy in dBFS
+    frames = audio[:num_frames * frame_len].reshape(num_frames, frame_len).astype(np.float32)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1) + 1e-12)
+    energy_db = 20 * np.log10(rms)
+
+    # Noise floor from the quietest frame of each block: even continuous speech has
+    # inter-word dips, so these minima track the background rather than the speakers.
+    # No absolute floor - quiet or far-mic speakers only need to clear the room noise.
+    block_frames = max(1, VAD_NOISE_BLOCK_MS // VAD_FRAME_MS)
+    num_blocks = max(1, num_frames // block_frames)
+    block_minima = energy_db[:num_blocks * block_frames].reshape(num_blocks, -1).min(axis=1) \
+        if num_frames >= block_frames else energy_db.min(keepdims=True)
+    noise_floor_db = float(np.percentile(block_minima, 5))
+    is_speech = energy_db > noise_floor_db + VAD_NOISE_MARGIN_DB
+
+    if not is_speech.any():
+        return [], noise_floor_db
+
+    # Collapse speech frames into [start, end) frame runs
+    edges = np.diff(np.concatenate(([0], is_speech.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    padding = int(sample_rate * VAD_PADDING_MS / 1000)
+    min_silence = int(sample_rate * VAD_MIN_SILENCE_MS / 1000)
+
+    regions: List[Tuple[int, int]] = []
+    for start_frame, end_frame in zip(starts, ends):
+        start = max(0, int(start_frame) * frame_len - padding)
+        end = min(len(audio), int(end_frame) * frame_len + padding)
+        # Merge with previous region if the pause between them is short
+        if regions and start - regions[-1][1] < min_silence:
+            regions[-1] = (regions[-1][0], max(regions[-1][1], end))
+        else:
+            regions.append((start, end))
+
+    # Leading/trailing stubs shorter than the silence threshold are not worth cutting
+    if regions[0][0] < min_silence:
+        regions[0] = (0, regions[0][1])
+    if len(audio) - regions[-1][1] < min_silence:
+        regions[-1] = (regions[-1][0], len(audio))
+
+    return regions, noise_floor_db
+
+
+def compact_audio(audio, regions: List[Tuple[int, int]],
+                  sample_rate: int = VAD_SAMPLE_RATE) -> Tuple[Any, List[Tuple[float, float]]]:
+    """
+    Concatenate speech regions into a single buffer
+    Returns: (compacted_audio, offset_map) where offset_map is a list of
+    (compacted_start_sec, original_start_sec), one entry per region
+    """
+    import numpy as np
+
+    offset_map: List[Tuple[float, float]] = []
+    chunks = []
+    position = 0
+    for start, end in regions:
+        offset_map.append((position / sample_rate, start / sample_rate))
+        chunks.append(audio[start:end])
+        position += end - start
+
+    compacted = np.concatenate(chunks) if chunks else audio[:0]
+    return compacted, offset_map
+
+
+def remap_time(t: float, offset_map: List[Tuple[float, float]], compacted_starts: List[float],
+               is_end: bool = False) -> float:
+    """Map a timestamp on the compacted audio back to original audio time"""
+    if t is None or not offset_map:
+        return t
+    # An end time sitting exactly on a splice belongs to the region before it
+    idx = bisect_right(compacted_starts, t) - 1
+    if is_end and idx > 0 and compacted_starts[idx] == t:
+        idx -= 1
+    compacted_start, original_start = offset_map[max(0, idx)]
+    return round(original_start + (t - compacted_start), 3)
+
+
+def remap_transcript_timestamps(result: Dict[str, Any], offset_map: List[Tuple[float, float]]) -> Dict[str, Any]:
+    """Shift segment, word and char timestamps from compacted time back to original time"""
+    compacted_starts = [c for c, _ in offset_map]
+
+    def _remap(item: Dict):
+        if 'start' in item:
+            item['start'] = remap_time(item['start'], offset_map, compacted_starts)
+        if 'end' in item:
+            item['end'] = remap_time(item['end'], offset_map, compacted_starts, is_end=True)
+
+    for seg in result.get('segments', []):
+        _remap(seg)
+        for word in seg.get('words', []):
+            _remap(word)
+        for char in seg.get('chars', []) or []:
+            _remap(char)
+
+    for word in result.get('word_segments', []):
+        _remap(word)
+
+    return result
+
+
+def cut_excess_db(audio, regions: List[Tuple[int, int]], noise_floor_db: float) -> float:
+    """
+    Mean power of the audio outside the kept regions, in dB above the noise floor
+    Near 0 when only room noise was cut; large when quiet speech was dropped
+    """
+    import numpy as np
+
+    kept = np.zeros(len(audio), dtype=bool)
+    for start, end in regions:
+        kept[start:end] = True
+    cut = audio[~kept]
+    if len(cut) == 0:
+        return 0.0
+
+    cut_power_db = 10 * np.log10(float(np.mean(np.square(cut, dtype=np.float64))) + 1e-12)
+    return cut_power_db - noise_floor_db
+
+
+def plan_silence_removal(audio) -> Tuple[Any, List[Tuple[float, float]], Dict[str, Any]]:
+    """
+    Detect speech, compact the audio and apply the safety fallbacks
+    Returns: (audio_to_transcribe, offset_map, stats); offset_map is empty when
+    nothing was cut, and stats['fallback'] names the reason full audio was kept
+    """
+    started = time.perf_counter()
+    regions, noise_floor_db = detect_speech_regions(audio)
+    original_sec = len(audio) / VAD_SAMPLE_RATE
+
+    stats: Dict[str, Any] = {
+        'regions': len(regions),
+        'original_sec': original_sec,
+        'compacted_sec': original_sec,
+        'noise_floor_db': noise_floor_db,
+        'cut_excess_db': None,
+        'fallback': None,
+    }
+    result: Tuple[Any, List[Tuple[float, float]]] = (audio, [])
+
+    if not regions:
+        stats['fallback'] = 'no speech detected'
+    elif regions != [(0, len(audio))]:
+        excess_db = cut_excess_db(audio, regions, noise_floor_db)
+        stats['cut_excess_db'] = excess_db
+        if excess_db > VAD_MAX_CUT_EXCESS_DB:
+            # Cut audio is clearly louder than room noise, so speech was likely dropped
+            stats['fallback'] = f'cut audio {excess_db:.1f} dB above noise floor'
+        else:
+            compacted, offset_map = compact_audio(audio, regions)
+            stats['compacted_sec'] = len(compacted) / VAD_SAMPLE_RATE
+            result = (compacted, offset_map)
+
+    stats['removed_fraction'] = 1 - stats['compacted_sec'] / original_sec if original_sec else 0.0
+    stats['vad_ms'] = (time.perf_counter() - started) * 1000
+    return result[0], result[1], stats
+
+
+def remove_silence(audio) -> Tuple[Any, List[Tuple[float, float]]]:
+    """
+    Run the VAD pre-pass when enabled and log how much audio was removed
+    Returns: (audio_to_transcribe, offset_map); offset_map is empty when nothing was cut
+    """
+    if not VAD_ENABLED or len(audio) == 0:
+        return audio, []
+
+    audio, offset_map, stats = plan_silence_removal(audio)
+
+    if stats['fallback']:
+        logger.warning(f"⚠️ VAD fallback ({stats['fallback']}) - transcribing full audio")
+
+    logger.info(
+        f"✓ VAD: {stats['regions']} speech regions, {stats['original_sec']:.1f}s -> "
+        f"{stats['compacted_sec']:.1f}s ({stats['removed_fraction']:.1%} silence removed) "
+        f"in {stats['vad_ms']:.0f}ms"
+    )
+    return audio, offset_map
+
+
 def transcribe_with_whisperx(audio_path: str) -> Dict[str, Any]:
     """
     Transcribe audio using WhisperX with speaker diarization
@@ -251,10 +462,17 @@ def transcribe_with_whisperx(audio_path: str) -> Dict[str, Any]:
         # Load audio
         audio = whisperx.load_audio(audio_path)
 
+        # Drop long silent stretches; timestamps are remapped after diarization
+        audio, offset_map = remove_silence(audio)
+
         # Transcribe
         logger.info("Transcribing audio...")
+        transcribe_started = time.perf_counter()
         result = model.transcribe(audio, batch_size=16)
-        logger.info(f"✓ Transcription complete. Language: {result.get('language', 'unknown')}")
+        logger.info(
+            f"✓ Transcription complete in {time.perf_counter() - transcribe_started:.1f}s. "
+            f"Language: {result.get('language', 'unknown')}"
+        )
 
         # Align timestamps
         logger.info("Aligning timestamps...")
@@ -288,6 +506,10 @@ def transcribe_with_whisperx(audio_path: str) -> Dict[str, Any]:
         else:
             logger.warning("⚠️ No HF_TOKEN - skipping diarization")
 
+        if offset_map:
+            result = remap_transcript_timestamps(result, offset_map)
+            logger.info("✓ Timestamps remapped to original audio")
+
         return result
 
     except Exception as e:
@@ -295,6 +517,153 @@ def transcribe_with_whisperx(audio_path: str) -> Dict[str, Any]:
         raise
 
 
+def load_summarizer_backend(precision: str = LLAMA_PRECISION) -> Dict[str, Any]:
+    """
+    Load the Llama summarizer in the requested precision mode
+    Returns: backend dict with tokenizer, model, mode, device and load stats
+    """
+    from transformers import AutoTokenizer, AutoModelForCausalLM
+    import torch
+
+    has_cuda = torch.cuda.is_available()
+    if precision == 'auto':
+        precision = 'fp16' if has_cuda else 'cpu-int8'
+    elif precision in ('fp16', '8bit', '4bit') and not has_cuda:
+        logger.warning(f"⚠️ LLAMA_PRECISION={precision} needs a GPU - falling back to cpu-int8")
+        precision = 'cpu-int8'
+
+    logger.info(f"Loading {LLAMA_MODEL_NAME} ({precision})...")
+    # Baseline excludes WhisperX/pyannote memory still held by this process
+    on_gpu = precision != 'cpu-int8'
+    if on_gpu:
+        torch.cuda.reset_peak_memory_stats()
+        memory_baseline = torch.cuda.memory_allocated()
+        peak_reset = True
+    else:
+        # Reset VmHWM so the reported peak covers only the load, including the transient fp32 weights
+        peak_reset = _reset_peak_rss()
+        memory_baseline = _proc_memory_bytes('VmRSS')
+    load_started = time.perf_counter()
+
+    tokenizer = AutoTokenizer.from_pretrained(LLAMA_MODEL_NAME)
+
+    if precision == 'fp16':
+        model = AutoModelForCausalLM.from_pretrained(
+            LLAMA_MODEL_NAME,
+            torch_dtype=torch.float16,
+            device_map="auto"
+        )
+    elif precision in ('8bit', '4bit'):
+        from transformers import BitsAndBytesConfig
+
+        if precision == '8bit':
+            quant_config = BitsAndBytesConfig(load_in_8bit=True)
+        else:
+            quant_config = BitsAndBytesConfig(
+                load_in_4bit=True,
+                bnb_4bit_quant_type="nf4",
+                bnb_4bit_compute_dtype=torch.float16,
+                bnb_4bit_use_double_quant=True
+            )
+        model = AutoModelForCausalLM.from_pretrained(
+            LLAMA_MODEL_NAME,
+            quantization_config=quant_config,
+            device_map="auto"
+        )
+    else:
+        # CPU: float32 weights with int8 dynamic quantization of the Linear layers.
+        # Quantize in place so the fp32 model is not deep-copied (~2x peak RSS otherwise)
+        model = AutoModelForCausalLM.from_pretrained(
+            LLAMA_MODEL_NAME,
+            torch_dtype=torch.float32,
+            low_cpu_mem_usage=True
+        )
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+    model.eval()
+    load_seconds = time.perf_counter() - load_started
+
+    backend = {
+        'tokenizer': tokenizer,
+        'model': model,
+        'mode': precision,
+        'device': 'cuda' if on_gpu else 'cpu',
+        'load_seconds': load_seconds,
+        'memory_baseline': memory_baseline,
+        'peak_reset': peak_reset,
+    }
+    _log_summarizer_memory(backend, "after load")
+    logger.info(f"✓ Summarizer loaded in {load_seconds:.1f}s (mode: {precision}, device: {backend['device']})")
+    return backend
+
+
+def _proc_memory_bytes(field: str) -> int:
+    """Read a memory field (e.g. VmRSS, VmHWM) for this process from /proc/self/status"""
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith(f'{field}:'):
+                return int(line.split()[1]) * 1024  # reported in kB
+    raise RuntimeError(f"{field} not found in /proc/self/status")
+
+
+def _reset_peak_rss() -> bool:
+    """Reset this process's peak RSS (VmHWM) to its current RSS; False if the kernel refuses"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as clear_refs:
+            clear_refs.write('5')
+        return True
+    except OSError as e:
+        logger.warning(f"Could not reset peak RSS (peak will include earlier stages): {e}")
+        return False
+
+
+def _log_summarizer_memory(backend: Dict[str, Any], stage: str):
+    """Log summarizer memory above the pre-load baseline (GPU peak allocated, or peak and current RSS on CPU)"""
+    try:
+        if backend['device'] == 'cuda':
+            import torch
+
+            used_gb = (torch.cuda.max_memory_allocated() - backend['memory_baseline']) / 1024 ** 3
+            logger.info(f"Summarizer [{backend['mode']}] GPU peak memory {stage}: {used_gb:.2f} GB")
+        else:
+            peak_gb = (_proc_memory_bytes('VmHWM') - backend['memory_baseline']) / 1024 ** 3
+            current_gb = (_proc_memory_bytes('VmRSS') - backend['memory_baseline']) / 1024 ** 3
+            peak_note = "" if backend['peak_reset'] else " (includes earlier stages)"
+            logger.info(
+                f"Summarizer [{backend['mode']}] RSS {stage}: peak +{peak_gb:.2f} GB{peak_note}, "
+                f"current +{current_gb:.2f} GB"
+            )
+    except Exception as e:
+        logger.warning(f"Could not read summarizer memory usage: {e}")
+
+
+def generate_with_backend(backend: Dict[str, Any], prompt: str, max_new_tokens: int, temperature: float) -> str:
+    """Run generation on a loaded summarizer backend and return the decoded text"""
+    import torch
+
+    tokenizer = backend['tokenizer']
+    model = backend['model']
+
+    inputs = tokenizer(prompt, return_tensors="pt").to(model.device)
+    started = time.perf_counter()
+    with torch.no_grad():
+        outputs = model.generate(
+            **inputs,
+            max_new_tokens=max_new_tokens,
+            temperature=temperature,
+            do_sample=True,
+            pad_token_id=tokenizer.eos_token_id
+        )
+    elapsed = time.perf_counter() - started
+
+    new_tokens = outputs.shape[-1] - inputs['input_ids'].shape[-1]
+    logger.info(
+        f"Summarizer [{backend['mode']}] generated {new_tokens} tokens in {elapsed:.1f}s "
+        f"({new_tokens / elapsed if elapsed else 0:.1f} tok/s)"
+    )
+    return tokenizer.decode(outputs[0], skip_special_tokens=True)
+
+
 def summarize_with_llama(transcript_text: str, segments: List[Dict]) -> Tuple[str, List[str]]:
     """
     Generate summary and extract keywords using Llama
@@ -303,19 +672,7 @@ def summarize_with_llama(transcript_text: str, segments: List[Dict]) -> Tuple[st
     logger.info("Starting Llama summarization...")
 
     try:
-        from transformers import AutoTokenizer, AutoModelForCausalLM
-        import torch
-
-        # Use Llama 3.2 3B Instruct (fits on smaller GPUs)
-        model_name = "meta-llama/Llama-3.2-3B-Instruct"
-
-        logger.info(f"Loading {model_name}...")
-        tokenizer = AutoTokenizer.from_pretrained(model_name)
-        model = AutoModelForCausalLM.from_pretrained(
-            model_name,
-            torch_dtype=torch.float16,
-            device_map="auto"
-        )
+        backend = load_summarizer_backend()
 
         # Limit transcript length to avoid token limits
         max_chars = 4000
@@ -339,16 +696,7 @@ Transcript:
 
         # Generate summary
         logger.info("Generating summary...")
-        inputs = tokenizer(summary_prompt, return_tensors="pt").to(model.device)
-        outputs = model.generate(
-            **inputs,
-            max_new_tokens=500,
-            temperature=0.7,
-            do_sample=True,
-            pad_token_id=tokenizer.eos_token_id
-        )
-
-        summary = tokenizer.decode(outputs[0], skip_special_tokens=True)
+        summary = generate_with_backend(backend, summary_prompt, max_new_tokens=500, temperature=0.7)
         # Extract just the assistant's response
         summary = summary.split("<|start_header_id|>assistant<|end_header_id|>")[-1].strip()
 
@@ -370,16 +718,7 @@ Keywords: """
 
         # Generate keywords
         logger.info("Extracting keywords...")
-        inputs = tokenizer(keywords_prompt, return_tensors="pt").to(model.device)
-        outputs = model.generate(
-            **inputs,
-            max_new_tokens=100,
-            temperature=0.5,
-            do_sample=True,
-            pad_token_id=tokenizer.eos_token_id
-        )
-
-        keywords_text = tokenizer.decode(outputs[0], skip_special_tokens=True)
+        keywords_text = generate_with_backend(backend, keywords_prompt, max_new_tokens=100, temperature=0.5)
         keywords_text = keywords_text.split("Keywords:")[-1].strip()
 
         # Parse keywords
@@ -387,6 +726,7 @@ Keywords: """
         keywords = keywords[:10]  # Limit to 10
 
         logger.info(f"✓ Extracted {len(keywords)} keywords")
+        _log_summarizer_memory(backend, "after generation")
 
         return summary, keywords
 
@@ -562,6 +902,13 @@ if __name__ == "__main__":
         logger.error("Missing required environment variable: TASK_ID")
         sys.exit(1)
 
+    # Fail fast on a bad summarizer config instead of silently skipping summaries on every job
+    if LLAMA_PRECISION not in LLAMA_PRECISION_MODES:
+        message = f"Unknown LLAMA_PRECISION '{LLAMA_PRECISION}' (expected one of {', '.join(LLAMA_PRECISION_MODES)})"
+        logger.error(f"❌ {message}")
+        update_task_status(task_id, 'FAILED', 'PROCESSING', message)
+        sys.exit(1)
+
     try:
         result = process_video(task_id)
         print(json.dumps(result, indent=2))